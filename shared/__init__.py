@@ -2,6 +2,7 @@
 # This file marks the directory as a Python package.
 
 from .redis_bus import RedisBus
+from .async_redis_bus import AsyncRedisBus
 from .a2a_envelope import (
     SourceAgent,
     Envelope,
@@ -12,10 +13,22 @@ from .a2a_envelope import (
 from .mcp_tools import (
     create_tool_use_request,
     get_tool_call_from_response,
+    register_gemini_cached_content,
+    Provider,
+    create_tool_use_request_p,
+    get_tool_call_from_response_p,
+)
+from .llm_client import (
+    post_openai,
+    post_gemini,
+    call_tool,
+    LLMCallBatcher,
+    create_gemini_cached_content,
 )
 
 __all__ = [
     "RedisBus",
+    "AsyncRedisBus",
     "SourceAgent",
     "Envelope",
     "StandardMessage",
@@ -23,4 +36,13 @@ __all__ = [
     "parse_message_from_stream",
     "create_tool_use_request",
     "get_tool_call_from_response",
+    "register_gemini_cached_content",
+    "Provider",
+    "create_tool_use_request_p",
+    "get_tool_call_from_response_p",
+    "post_openai",
+    "post_gemini",
+    "call_tool",
+    "LLMCallBatcher",
+    "create_gemini_cached_content",
 ]
\ No newline at end of file
@@ -0,0 +1,35 @@
+# shared/_utils.py
+"""
+Small helpers shared by the envelope and tool-calling modules. They sit on
+the per-message path, so they avoid building datetime objects.
+"""
+import os
+import time
+import threading
+
+_iso_cache = threading.local()
+
+def _fast_iso_utc() -> str:
+    """
+    Current UTC time as an ISO 8601 string with millisecond precision,
+    e.g. '2025-01-31T12:00:00.123+00:00'. The '+00:00' offset (rather than 'Z')
+    keeps it parseable by datetime.fromisoformat() on Python 3.10.
+    The 'YYYY-MM-DDTHH:MM:SS' prefix is formatted once per second per thread
+    and reused for every timestamp that falls in the same second.
+    """
+    sec, rem = divmod(time.time_ns(), 1_000_000_000)
+    if getattr(_iso_cache, "sec", None) != sec:
+        _iso_cache.prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_cache.sec = sec
+    return f"{_iso_cache.prefix}.{rem // 1_000_000:03d}+00:00"
+
+def _fast_id() -> str:
+    """
+    Time-ordered UUIDv7 string (RFC 9562): 48-bit Unix milliseconds followed
+    by version/variant bits and 74 random bits. Formatted directly instead of
+    going through uuid.UUID, and ids from one producer sort by creation time.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76 | 0x3 << 62) | 0x7 << 76 | 0x2 << 62
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
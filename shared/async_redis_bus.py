@@ -0,0 +1,137 @@
+# shared/async_redis_bus.py
+"""
+Asyncio counterpart of `RedisBus`, built on `redis.asyncio`. A single event
+loop can keep many XADD / XREADGROUP calls in flight at once instead of
+blocking a thread per call.
+
+Usage
+-----
+A message publisher:
+>>> from shared.a2a_envelope import wrap_envelope
+>>> from shared.async_redis_bus import AsyncRedisBus
+>>> bus = AsyncRedisBus()
+>>> await bus.connect()
+>>> await bus.publish(wrap_envelope(payload={"data": 123}, ...))
+>>> await bus.publish_many([msg1, msg2, msg3])
+
+A message subscriber:
+>>> bus = AsyncRedisBus()
+>>> streams = ['clues.photo.raw', 'clues.interview.raw']
+>>> async with contextlib.aclosing(bus.subscribe("intelligence-consumers", "clue-meister-1", streams)) as sub:
+...     async for message in sub:
+...         print(f"Received message from {message.envelope.source_agent.name}")
+...         # Your processing logic here
+"""
+
+import os
+import asyncio
+import logging
+import redis
+import redis.asyncio
+from typing import AsyncGenerator, Iterable, List
+
+from .a2a_envelope import StandardMessage
+from .redis_bus import _BODY_FIELD, _USE_DEFAULT, _check_group_results, _parse_batch, _queue_acks
+
+logger = logging.getLogger(__name__)
+
+class AsyncRedisBus:
+    def __init__(self, redis_url: str | None = None, default_maxlen: int | None = 100_000):
+        """
+        Args:
+            redis_url (str, optional): Redis URL. If None, falls back to
+                                       the REDIS_URL environment variable.
+            default_maxlen (int, optional): Stream length cap; see `RedisBus`.
+
+        No connection is opened here; call `connect()` to verify the server
+        is reachable, or let the first command open the pool lazily.
+        """
+        self.default_maxlen = default_maxlen
+        self.url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.client = redis.asyncio.Redis.from_url(self.url, decode_responses=False)
+
+    async def connect(self):
+        try:
+            await self.client.ping()
+            logger.info(f"AsyncRedisBus successfully connected -> {self.url}")
+        except redis.exceptions.ConnectionError as e:
+            logger.error(f"AsyncRedisBus could not connect to Redis: {e}", exc_info=True)
+            raise
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def publish(self, message: StandardMessage, maxlen: int | None = _USE_DEFAULT):
+        """
+        Publishes a message. `maxlen` overrides `default_maxlen` for this XADD;
+        None publishes without trimming the stream.
+        """
+        target_stream = message.envelope.target_stream
+        try:
+            message_body = message.encode()
+            await self.client.xadd(
+                target_stream,
+                {_BODY_FIELD: message_body},
+                maxlen=self.default_maxlen if maxlen is _USE_DEFAULT else maxlen,
+                approximate=True,
+            )
+            logger.debug(f"Published message {message.envelope.message_id} -> {target_stream}")
+        except redis.RedisError as e:
+            logger.error(f"Failed to publish to stream '{target_stream}': {e}", exc_info=True)
+
+    async def publish_many(self, messages: Iterable[StandardMessage], maxlen: int | None = _USE_DEFAULT):
+        """Publishes all messages concurrently instead of awaiting each XADD in turn."""
+        await asyncio.gather(*(self.publish(m, maxlen) for m in messages))
+
+    async def _ensure_group_many(self, streams: List[str], group_name: str):
+        """
+        Internal helper to create streams and consumer groups that don't exist yet.
+        All XGROUP CREATE calls go out in one pipeline instead of a round-trip per stream.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for stream_name in streams:
+            pipe.xgroup_create(stream_name, group_name, id='0', mkstream=True)
+        _check_group_results(streams, group_name, await pipe.execute(raise_on_error=False))
+
+    async def subscribe(
+        self,
+        group_name: str,
+        consumer_name: str,
+        streams: List[str],
+        block_ms: int = 0,
+        count: int = 64,
+    ) -> AsyncGenerator[StandardMessage, None]:
+        """
+        Subscribes to streams and yields parsed messages.
+
+        Batching and acknowledgement follow `RedisBus.subscribe`: up to `count`
+        entries per read, acknowledged in one pipelined round-trip once they
+        have been yielded, so a consumer that stops mid-batch leaves the rest
+        pending. An async generator is not closed by `break`, so wrap it in
+        `contextlib.aclosing()` to have the delivered messages acked promptly.
+        """
+        stream_mapping = {s: '>' for s in streams}
+        await self._ensure_group_many(streams, group_name)
+
+        logger.info(f"Consumer '{consumer_name}' listening on streams: {streams}")
+
+        while True:
+            try:
+                response = await self.client.xreadgroup(group_name, consumer_name, stream_mapping, count=count, block=block_ms)
+                if not response:
+                    continue
+
+                parsed_batch, skipped = _parse_batch(response)
+                handed_out = 0
+                try:
+                    for _, _, parsed_message in parsed_batch:
+                        handed_out += 1
+                        yield parsed_message
+                finally:
+                    pipe = self.client.pipeline(transaction=False)
+                    if _queue_acks(pipe, group_name, skipped, parsed_batch[:handed_out]):
+                        await pipe.execute()
+
+            except Exception as e:
+                logger.error(f"Unexpected error in subscribe loop: {e}", exc_info=True)
+                await asyncio.sleep(1)
@@ -0,0 +1,345 @@
+# shared/llm_client.py
+"""
+Async HTTP transport for the request bodies built by `mcp_tools`.
+
+Every call goes through one shared `httpx.AsyncClient`, so TCP/TLS
+connections are kept alive and multiplexed over HTTP/2 instead of being
+re-established per tool call.
+
+Usage
+-----
+>>> from shared.llm_client import call_tool
+>>> tool_call = await call_tool(
+...     conversation=[{"role": "user", "content": "Find similar cases."}],
+...     tools=[redis_search_tool],
+...     system_instruction="You are a SAR reasoning agent.",
+...     provider="openai",
+... )
+>>> if tool_call:
+...     name, args = tool_call
+
+Agents making many concurrent calls can share an `LLMCallBatcher`, which
+groups requests arriving within a short window and dispatches them
+concurrently under a requests-per-minute budget:
+>>> batcher = LLMCallBatcher(qpm=500)
+>>> tool_call = await call_tool(conversation=..., tools=..., batcher=batcher)
+
+Credentials come from OPENAI_API_KEY / GEMINI_API_KEY (a RuntimeError is
+raised if the one needed is unset); OPENAI_BASE_URL and GEMINI_BASE_URL
+override the default endpoints.
+"""
+
+from __future__ import annotations
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Literal, Set, Tuple
+
+import httpx
+
+from .mcp_tools import (
+    create_tool_use_request,
+    get_tool_call_from_response,
+    register_gemini_cached_content,
+    _DEFAULT_GEMINI_MODEL,
+    _gemini_system_turns,
+    _gemini_tools_for,
+)
+
+logger = logging.getLogger(__name__)
+
+_OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+_GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _make_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        timeout=60,
+    )
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client for the running event loop. Pooled connections
+    belong to the loop that opened them, so a new loop (e.g. a second
+    `asyncio.run()`) gets a fresh client instead of the stale one.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _make_client()
+        _client_loop = loop
+    return _client
+
+
+async def aclose() -> None:
+    """Closes the shared client; the next call opens a fresh one."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+
+
+def _api_key(env_var: str) -> str:
+    key = os.getenv(env_var)
+    if not key:
+        raise RuntimeError(f"{env_var} is not set; cannot authenticate the LLM request")
+    return key
+
+
+async def post_openai(req_body: Dict[str, Any]) -> Dict[str, Any]:
+    """POSTs a body from `create_tool_use_request(provider="openai")` to chat/completions."""
+    resp = await _get_client().post(
+        f"{_OPENAI_BASE_URL}/chat/completions",
+        json=req_body,
+        headers={"Authorization": f"Bearer {_api_key('OPENAI_API_KEY')}"},
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def post_gemini(req_body: Dict[str, Any], model: str | None = None) -> Dict[str, Any]:
+    """POSTs a body from `create_tool_use_request(provider="gemini")` to generateContent."""
+    chosen_model = model or _DEFAULT_GEMINI_MODEL
+    resp = await _get_client().post(
+        f"{_GEMINI_BASE_URL}/models/{chosen_model}:generateContent",
+        json=req_body,
+        headers={"x-goog-api-key": _api_key("GEMINI_API_KEY")},
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def create_gemini_cached_content(
+    *,
+    system_instruction: str | None,
+    tools: List[Dict[str, Any]],
+    model: str | None = None,
+    ttl_s: int = 3600,
+) -> str:
+    """
+    Uploads the static system turns + tools as a Gemini `cachedContents`
+    resource and registers it, so `create_tool_use_request(..., cache_static=True)`
+    references it by name. Returns the resource name.
+    """
+    chosen_model = model or _DEFAULT_GEMINI_MODEL
+    resp = await _get_client().post(
+        f"{_GEMINI_BASE_URL}/cachedContents",
+        json={
+            "model": f"models/{chosen_model}",
+            "contents": _gemini_system_turns(system_instruction),
+            "tools": _gemini_tools_for(tools),
+            "ttl": f"{ttl_s}s",
+        },
+        headers={"x-goog-api-key": _api_key("GEMINI_API_KEY")},
+    )
+    resp.raise_for_status()
+    name = resp.json()["name"]
+    register_gemini_cached_content(
+        name, model=chosen_model, system_instruction=system_instruction, tools=tools
+    )
+    logger.info(f"[LLM Client] Created Gemini cached content {name} (ttl={ttl_s}s)")
+    return name
+
+
+async def _post(req_body: Dict[str, Any], provider: str, model: str | None) -> Dict[str, Any]:
+    if provider.lower() == "gemini":
+        return await post_gemini(req_body, model)
+    return await post_openai(req_body)
+
+
+_BatchItem = Tuple[Dict[str, Any], str, "str | None", "asyncio.Future[Dict[str, Any]]"]
+
+
+class LLMCallBatcher:
+    """
+    Collects request bodies submitted within `batch_window_ms` (up to
+    `max_batch` at a time) and dispatches each batch concurrently over the
+    shared client. Request starts are spaced to stay within `qpm` requests
+    per minute, and at most `max_concurrency` requests are in flight.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_window_ms: int = 20,
+        max_batch: int = 32,
+        qpm: int = 500,
+        max_concurrency: int = 64,
+    ):
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self._interval = 60 / qpm
+        self._closed = False
+        self._bind(None)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        """
+        Gives the batcher a fresh queue, semaphore and collector for `loop`.
+        asyncio primitives are tied to the loop that first uses them, so a
+        batcher shared across `asyncio.run()` calls rebinds on each new loop.
+        """
+        self._loop = loop
+        self._next_slot = 0.0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._queue: asyncio.Queue[_BatchItem] = asyncio.Queue()
+        self._loop_task: asyncio.Task | None = None
+        self._inflight: Set[asyncio.Future] = set()
+
+    async def submit(
+        self,
+        req_body: Dict[str, Any],
+        *,
+        provider: Literal["openai", "gemini"] = "openai",
+        model: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Queues a request body and waits for the provider's JSON response.
+        Raises RuntimeError if the batcher is closed, or was closed before the
+        request was dispatched.
+        """
+        if self._closed:
+            raise RuntimeError("batcher closed")
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._bind(loop)
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = loop.create_task(self._run())
+            self._loop_task.add_done_callback(self._on_run_done)
+
+        fut: asyncio.Future[Dict[str, Any]] = loop.create_future()
+        self._queue.put_nowait((req_body, provider, model, fut))
+        return await fut
+
+    async def close(self) -> None:
+        """
+        Stops accepting and collecting requests, fails those not yet dispatched
+        with RuntimeError, and waits for the in-flight ones to finish.
+        """
+        self._closed = True
+        if self._loop is not asyncio.get_running_loop():
+            # Anything left belongs to a loop that has already shut down.
+            self._bind(None)
+            return
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending)
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    @staticmethod
+    def _fail(items: List[_BatchItem], message: str = "batcher closed", cause: BaseException | None = None) -> None:
+        for *_, fut in items:
+            if not fut.done():
+                err = RuntimeError(message)
+                err.__cause__ = cause
+                fut.set_exception(err)
+
+    def _on_run_done(self, task: asyncio.Task) -> None:
+        # close() handles cancellation; this covers a collector that crashed,
+        # so queued callers get an error instead of waiting forever.
+        if task.cancelled() or task.exception() is None:
+            return
+        exc = task.exception()
+        logger.error(f"[LLM Client] Batch collector failed: {exc!r}")
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, "batcher collector failed", exc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_BatchItem] = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.batch_window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                logger.debug(f"[LLM Client] Dispatching batch of {len(batch)} request(s)")
+                batch_fut = asyncio.gather(*(self._dispatch(*item) for item in batch))
+            except BaseException as e:
+                # Requests pulled off the queue but not yet dispatched.
+                if isinstance(e, asyncio.CancelledError):
+                    self._fail(batch)
+                else:
+                    self._fail(batch, "batcher collector failed", e)
+                raise
+            self._inflight.add(batch_fut)
+            batch_fut.add_done_callback(self._inflight.discard)
+
+    async def _wait_for_slot(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _dispatch(self, req_body, provider, model, fut: asyncio.Future) -> None:
+        async with self._semaphore:
+            await self._wait_for_slot()
+            try:
+                result = await _post(req_body, provider, model)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+            else:
+                if not fut.done():
+                    fut.set_result(result)
+
+
+async def call_tool(
+    *,
+    conversation: List[Dict[str, str]],
+    tools: List[Dict[str, Any]],
+    system_instruction: str | None = None,
+    provider: Literal["openai", "gemini"] = "openai",
+    model: str | None = None,
+    cache_static: bool = False,
+    batcher: LLMCallBatcher | None = None,
+) -> Tuple[str, Dict[str, Any]] | None:
+    """
+    Builds the tool-use request, sends it over the shared client and returns
+    the parsed `(name, args)` tool call, or None if the model did not call a tool.
+    Parameters match `create_tool_use_request`; pass `batcher` to route the
+    request through an `LLMCallBatcher`.
+    """
+    req_body = create_tool_use_request(
+        conversation=conversation,
+        tools=tools,
+        system_instruction=system_instruction,
+        provider=provider,
+        model=model,
+        cache_static=cache_static,
+    )
+    if batcher is not None:
+        llm_response = await batcher.submit(req_body, provider=provider, model=model)
+    else:
+        llm_response = await _post(req_body, provider, model)
+
+    return get_tool_call_from_response(llm_response, provider=provider)
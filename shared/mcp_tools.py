@@ -38,29 +38,43 @@ tool_call = get_tool_call_from_response(resp_json, provider="openai")
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-import uuid
-from datetime import datetime, timezone
+from enum import IntEnum
 from typing import Any, Dict, List, Literal, Tuple
 import logging
+
+from ._utils import _fast_id, _fast_iso_utc
+
 logger = logging.getLogger(__name__)
 
 def _utc_now_iso() -> str:
-    return (
-        datetime.utcnow()
-        .isoformat(timespec="milliseconds")
-        .replace("+00:00", "Z")
-    )
+    return _fast_iso_utc()
 # -------- OpenAI --------
 def _build_openai_prompt(
     conversation: List[Dict[str, str]],
     tools: List[Dict[str, Any]],
     system_instruction: str | None,
     model: str,
+    cache_static: bool = False,
 ) -> Dict[str, Any]:
-    messages: List[Dict[str, str]] = []
-    if system_instruction:
+    """
+    Builds a chat/completions body. `cache_static=True` sends the system
+    message as a content block with an Anthropic-style `cache_control`
+    breakpoint; that field is only understood by Anthropic's
+    OpenAI-compatible endpoint and proxies that forward it (OpenRouter,
+    LiteLLM). api.openai.com caches prefixes automatically; leave it off there.
+    """
+    messages: List[Dict[str, Any]] = []
+    if system_instruction and cache_static:
+        # Everything up to and including this block (tools + system) is
+        # marked as a cacheable prefix.
+        messages.append({
+            "role": "system",
+            "content": [{"type": "text", "text": system_instruction, "cache_control": {"type": "ephemeral"}}],
+        })
+    elif system_instruction:
         messages.append({"role": "system", "content": system_instruction})
     messages.extend(conversation)
 
@@ -70,7 +84,7 @@ def _build_openai_prompt(
         "tools": tools,
         "tool_choice": "auto",
         "metadata": {
-            "request_id": str(uuid.uuid4()),
+            "request_id": _fast_id(),
             "timestamp_utc": _utc_now_iso(),
         },
     }
@@ -95,25 +109,81 @@ def _parse_openai_response(
 
 
 # -------- Google Gemini --------
+def _gemini_tools_for(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converts OpenAI-style tool schemas to Gemini's `function_declarations` form.
+    Built fresh on every call: the result ends up inside a request body the
+    caller may mutate, and a cache keyed on the input list cannot see
+    in-place edits to it.
+    """
+    return [{"function_declarations": [t["function"] for t in tools]}]
+
+
+def _gemini_system_turns(system_instruction: str | None) -> List[Dict[str, Any]]:
+    if not system_instruction:
+        return []
+    return [
+        {"role": "user", "parts": [{"text": system_instruction}]},
+        {"role": "model", "parts": [{"text": "OK, I am ready to act as your SAR reasoning agent."}]},
+    ]
+
+
+# static-prefix key -> cachedContents resource name (e.g. "cachedContents/abc123")
+_GEMINI_CACHED_CONTENT: Dict[str, str] = {}
+
+
+def _static_prefix_key(
+    model: str, system_instruction: str | None, tools: List[Dict[str, Any]]
+) -> str:
+    """
+    Content hash of the static prefix. Recomputed on every call: a memo keyed
+    on the tools list would keep matching after the list is edited in place
+    and send the old cachedContent without the new tools.
+    """
+    raw = json.dumps([model, system_instruction, tools], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def register_gemini_cached_content(
+    name: str,
+    *,
+    model: str,
+    system_instruction: str | None,
+    tools: List[Dict[str, Any]],
+) -> None:
+    """
+    Records that the Gemini `cachedContents` resource `name` holds the system
+    turns and tools for `model`. Later requests built with `cache_static=True`
+    and the same prefix reference it instead of resending that content.
+    """
+    _GEMINI_CACHED_CONTENT[_static_prefix_key(model, system_instruction, tools)] = name
+
+
 def _build_gemini_prompt(
     conversation: List[Dict[str, str]],
     tools: List[Dict[str, Any]],
     system_instruction: str | None,
     model: str,
+    cache_static: bool = False,
 ) -> Dict[str, Any]:
-    gemini_tools = [{"function_declarations": [t["function"] for t in tools]}]
-    gemini_contents = []
-    if system_instruction:
-        gemini_contents.append({"role": "user", "parts": [{"text": system_instruction}]})
-        gemini_contents.append({"role": "model", "parts": [{"text": "OK, I am ready to act as your SAR reasoning agent."}]})
+    cached_name = None
+    if cache_static and _GEMINI_CACHED_CONTENT:
+        cached_name = _GEMINI_CACHED_CONTENT.get(_static_prefix_key(model, system_instruction, tools))
 
+    gemini_contents = [] if cached_name else _gemini_system_turns(system_instruction)
     for msg in conversation:
         role = "model" if msg["role"] == "assistant" else "user"
         gemini_contents.append({"role": role, "parts": [{"text": msg["content"]}]})
 
+    if cached_name:
+        # Gemini rejects tools / system content alongside a cachedContent.
+        return {
+            "contents": gemini_contents,
+            "cachedContent": cached_name,
+        }
     return {
         "contents": gemini_contents,
-        "tools": gemini_tools,
+        "tools": _gemini_tools_for(tools),
     }
 
 
@@ -138,18 +208,28 @@ def _parse_gemini_response(
 _DEFAULT_OPENAI_MODEL = os.getenv("OPENAI_DEFAULT_MODEL", "gpt-4.1-nano")
 _DEFAULT_GEMINI_MODEL = os.getenv("GEMINI_DEFAULT_MODEL", "gemini-1.5-flash")
 
-_PROVIDER_MAP = {
-    "openai": {
-        "build": _build_openai_prompt,
-        "parse": _parse_openai_response,
-        "default_model": _DEFAULT_OPENAI_MODEL,
-    },
-    "gemini": {
-        "build": _build_gemini_prompt,
-        "parse": _parse_gemini_response,
-        "default_model": _DEFAULT_GEMINI_MODEL,
-    },
+# Resolved once at import; canonical provider names hit these directly and
+# only non-canonical spellings pay for a .lower().
+_BUILDERS = {
+    "openai": (_build_openai_prompt, _DEFAULT_OPENAI_MODEL),
+    "gemini": (_build_gemini_prompt, _DEFAULT_GEMINI_MODEL),
 }
+_PARSERS = {
+    "openai": _parse_openai_response,
+    "gemini": _parse_gemini_response,
+}
+
+
+class Provider(IntEnum):
+    """Integer provider ids for the `_p` variants, which index straight into tuples."""
+    OPENAI = 0
+    GEMINI = 1
+
+
+# Indexed by Provider; keep in the same order as the enum members.
+_BUILD = (_BUILDERS["openai"], _BUILDERS["gemini"])
+_PARSE = (_PARSERS["openai"], _PARSERS["gemini"])
+_PROVIDER_NAMES = ("openai", "gemini")
 
 def create_tool_use_request(
     *,
@@ -158,6 +238,7 @@ def create_tool_use_request(
     system_instruction: str | None = None,
     provider: Literal["openai", "gemini"] = "openai",
     model: str | None = None,
+    cache_static: bool = False,
 ) -> Dict[str, Any]:
     """
     Parameters
@@ -167,20 +248,23 @@ def create_tool_use_request(
     system_instruction : optional system message
     provider      : "openai" | "gemini"
     model         : overrides provider default
+    cache_static  : mark the invariant tools + system prefix as cacheable
+                    (cache_control on the system block for OpenAI-compatible
+                    endpoints; a registered cachedContent for Gemini)
 
     Returns
     -------
     dict : ready to pass to the provider’s chat endpoint
     """
-    provider = provider.lower()
-    if provider not in _PROVIDER_MAP:
+    entry = _BUILDERS.get(provider) or _BUILDERS.get(provider.lower())
+    if entry is None:
         raise ValueError(f"Unsupported provider '{provider}'")
 
-    builder = _PROVIDER_MAP[provider]["build"]
-    chosen_model = model or _PROVIDER_MAP[provider]["default_model"]
+    builder, default_model = entry
+    chosen_model = model or default_model
     logger.info(f"[MCP Tools] Provider={provider}, Using model={chosen_model}")
 
-    return builder(conversation, tools, system_instruction, chosen_model)
+    return builder(conversation, tools, system_instruction, chosen_model, cache_static)
 
 
 def get_tool_call_from_response(
@@ -188,9 +272,36 @@ def get_tool_call_from_response(
     *,
     provider: Literal["openai", "gemini"] = "openai",
 ) -> Tuple[str, Dict[str, Any]] | None:
-    provider = provider.lower()
-    if provider not in _PROVIDER_MAP:
+    parser = _PARSERS.get(provider) or _PARSERS.get(provider.lower())
+    if parser is None:
         raise ValueError(f"Unsupported provider '{provider}'")
 
-    parser = _PROVIDER_MAP[provider]["parse"]
     return parser(llm_response)
+
+
+def create_tool_use_request_p(
+    provider: Provider,
+    *,
+    conversation: List[Dict[str, str]],
+    tools: List[Dict[str, Any]],
+    system_instruction: str | None = None,
+    model: str | None = None,
+    cache_static: bool = False,
+) -> Dict[str, Any]:
+    """
+    `create_tool_use_request` keyed by `Provider` instead of a provider string;
+    the builder is picked by tuple index with no string hashing or lowering.
+    """
+    builder, default_model = _BUILD[provider]
+    chosen_model = model or default_model
+    logger.info(f"[MCP Tools] Provider={_PROVIDER_NAMES[provider]}, Using model={chosen_model}")
+
+    return builder(conversation, tools, system_instruction, chosen_model, cache_static)
+
+
+def get_tool_call_from_response_p(
+    provider: Provider,
+    llm_response: Dict[str, Any],
+) -> Tuple[str, Dict[str, Any]] | None:
+    """`get_tool_call_from_response` keyed by `Provider` instead of a provider string."""
+    return _PARSE[provider](llm_response)
@@ -25,19 +25,88 @@ import os
 import time
 import logging
 import redis
-from typing import List, Generator
+from typing import Any, Dict, List, Generator, Tuple
 
 from .a2a_envelope import StandardMessage, parse_message_from_stream
 
 logger = logging.getLogger(__name__)
 
+# Stream entry field holding the encoded StandardMessage; pre-encoded so
+# redis-py does not convert it on every XADD.
+_BODY_FIELD = b"body"
+
+# Default for `publish(maxlen=...)`: use the bus's `default_maxlen`. Distinct
+# from None, which means "do not trim".
+_USE_DEFAULT: Any = object()
+
+
+def _parse_batch(response) -> Tuple[List[Tuple[bytes, bytes, StandardMessage]], List[Tuple[bytes, List[bytes]]]]:
+    """
+    Splits an XREADGROUP response into `(stream, id, message)` triples for the
+    entries that parsed and, per stream, the ids of the ones that did not.
+    Unparseable entries are logged; callers acknowledge them straight away so
+    they are not redelivered.
+    """
+    parsed_batch = []
+    skipped = []
+    parse = parse_message_from_stream
+    for stream_b, messages in response:
+        if not messages:
+            continue
+        # Split the entries into id / body columns, then validate the bodies
+        # in one tight loop with the parser bound locally.
+        msg_ids = [msg_id for msg_id, _ in messages]
+        bodies = [data_b.get(_BODY_FIELD) for _, data_b in messages]
+        bad_ids = []
+        for msg_id, body in zip(msg_ids, bodies):
+            parsed_message = parse(body) if body is not None else None
+            if parsed_message:
+                parsed_batch.append((stream_b, msg_id, parsed_message))
+            else:
+                bad_ids.append(msg_id)
+                logger.warning("Unable to parse message %s on %s. Message acknowledged and skipped.",
+                               msg_id.decode(), stream_b.decode())
+        if bad_ids:
+            skipped.append((stream_b, bad_ids))
+    return parsed_batch, skipped
+
+
+def _queue_acks(pipe, group_name: str, skipped: List[Tuple[bytes, List[bytes]]],
+                delivered: List[Tuple[bytes, bytes, StandardMessage]]) -> bool:
+    """Queues one XACK per stream on `pipe`; returns False if there was nothing to ack."""
+    ids_by_stream: Dict[bytes, List[bytes]] = {}
+    for stream_b, msg_ids in skipped:
+        ids_by_stream.setdefault(stream_b, []).extend(msg_ids)
+    for stream_b, msg_id, _ in delivered:
+        ids_by_stream.setdefault(stream_b, []).append(msg_id)
+    for stream_b, msg_ids in ids_by_stream.items():
+        pipe.xack(stream_b, group_name, *msg_ids)
+    return bool(ids_by_stream)
+
+
+def _check_group_results(streams: List[str], group_name: str, results: list) -> None:
+    """Logs the outcome of pipelined XGROUP CREATE calls; BUSYGROUP is fine, other errors raise."""
+    for stream_name, result in zip(streams, results):
+        if isinstance(result, redis.exceptions.ResponseError) and "BUSYGROUP" in str(result):
+            logger.debug(f"Group '{group_name}' on stream '{stream_name}' already exists.")
+        elif isinstance(result, Exception):
+            raise result
+        else:
+            logger.info(f"Created consumer group '{group_name}' on stream '{stream_name}'.")
+
 class RedisBus:
-    def __init__(self, redis_url: str | None = None):
+    def __init__(self, redis_url: str | None = None, default_maxlen: int | None = 100_000):
         """
         Args:
             redis_url (str, optional): Redis URL. If None, falls back to
                                        the REDIS_URL environment variable.
+            default_maxlen (int, optional): Approximate cap on the length of every
+                                       stream published to (XADD MAXLEN ~). Trimming
+                                       drops the oldest entries even if a consumer
+                                       group has not acknowledged them yet. None
+                                       disables trimming.
         """
+        self.default_maxlen = default_maxlen
         url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
         try:
             self.client = redis.Redis.from_url(url, decode_responses=False)
@@ -47,55 +116,74 @@ class RedisBus:
             logger.error(f"RedisBus could not connect to Redis: {e}", exc_info=True)
             raise
 
-    def publish(self, message: StandardMessage):
+    def publish(self, message: StandardMessage, maxlen: int | None = _USE_DEFAULT):
+        """
+        Publishes a message. `maxlen` overrides `default_maxlen` for this XADD;
+        None publishes without trimming the stream.
+        """
         target_stream = message.envelope.target_stream
         try:
-            message_body = message.model_dump_json().encode('utf-8')
-            self.client.xadd(target_stream, {"body": message_body})
+            message_body = message.encode()
+            self.client.xadd(
+                target_stream,
+                {_BODY_FIELD: message_body},
+                maxlen=self.default_maxlen if maxlen is _USE_DEFAULT else maxlen,
+                approximate=True,
+            )
             logger.debug(f"Published message {message.envelope.message_id} -> {target_stream}")
         except redis.RedisError as e:
             logger.error(f"Failed to publish to stream '{target_stream}': {e}", exc_info=True)
 
-    def _ensure_group(self, stream_name: str, group_name: str):
-        """Internal helper to create a stream and consumer group if they don't exist."""
-        try:
-            self.client.xgroup_create(stream_name, group_name, id='0', mkstream=True)
-            logger.info(f"Created consumer group '{group_name}' on stream '{stream_name}'.")
-        except redis.exceptions.ResponseError as e:
-            if "BUSYGROUP" in e.args[0]:
-                logger.debug(f"Group '{group_name}' on stream '{stream_name}' already exists.")
-            else:
-                raise
+    def _ensure_group_many(self, streams: List[str], group_name: str):
+        """
+        Internal helper to create streams and consumer groups that don't exist yet.
+        All XGROUP CREATE calls go out in one pipeline instead of a round-trip per stream.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for stream_name in streams:
+            pipe.xgroup_create(stream_name, group_name, id='0', mkstream=True)
+        _check_group_results(streams, group_name, pipe.execute(raise_on_error=False))
 
     def subscribe(
-        self, group_name: str, consumer_name: str, streams: List[str], block_ms: int = 0
+        self,
+        group_name: str,
+        consumer_name: str,
+        streams: List[str],
+        block_ms: int = 0,
+        count: int = 64,
     ) -> Generator[StandardMessage, None, None]:
-        """Subscribes to streams and yields parsed messages."""
+        """
+        Subscribes to streams and yields parsed messages.
+
+        Up to `count` entries are read per XREADGROUP call. Once the batch has
+        been consumed, its entries are acknowledged with a single pipelined
+        round-trip. If the consumer stops mid-batch (break, close, exception),
+        only the messages already yielded are acknowledged; the rest stay in
+        the group's pending list.
+        """
         stream_mapping = {s: '>' for s in streams}
-        for stream in streams:
-            self._ensure_group(stream, group_name)
+        self._ensure_group_many(streams, group_name)
         
         logger.info(f"Consumer '{consumer_name}' listening on streams: {streams}")
         
         while True:
             try:
-                response = self.client.xreadgroup(group_name, consumer_name, stream_mapping, count=1, block=block_ms)
+                response = self.client.xreadgroup(group_name, consumer_name, stream_mapping, count=count, block=block_ms)
                 if not response:
                     continue
 
-                stream_b, messages = response[0]
-                msg_id, data_b = messages[0]
-                
-                decoded_data = {k.decode('utf-8'): v.decode('utf-8') for k, v in data_b.items()}
-                parsed_message = parse_message_from_stream(decoded_data)
-
-                self.client.xack(stream_b, group_name, msg_id)
-
-                if parsed_message:
-                    yield parsed_message
-                else:
-                    logger.warning("Unable to parse message %s on %s. Message acknowledged and skipped.", 
-                                   msg_id.decode(), stream_b.decode())
+                parsed_batch, skipped = _parse_batch(response)
+                handed_out = 0
+                try:
+                    for _, _, parsed_message in parsed_batch:
+                        handed_out += 1
+                        yield parsed_message
+                finally:
+                    # Only entries actually handed to the consumer are acked; if it
+                    # stops mid-batch the rest stay pending for redelivery.
+                    pipe = self.client.pipeline(transaction=False)
+                    if _queue_acks(pipe, group_name, skipped, parsed_batch[:handed_out]):
+                        pipe.execute()
 
             except Exception as e:
                 logger.error(f"Unexpected error in subscribe loop: {e}", exc_info=True)
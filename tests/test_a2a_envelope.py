@@ -0,0 +1,31 @@
+import orjson
+
+from shared.a2a_envelope import StandardMessage, parse_message_from_stream, wrap_envelope
+
+
+def _message(payload=None):
+    return wrap_envelope(payload=payload or {"n": 1, "s": "é\"x", "nested": {"a": [1, 2]}},
+                         source_name="agent", source_version="1.0", target_stream="clues.raw")
+
+
+def test_as_dict_matches_model_dump():
+    msg = _message()
+    assert msg.as_dict() == msg.model_dump()
+
+
+def test_encode_matches_model_dump_and_round_trips():
+    msg = _message()
+    assert orjson.loads(msg.encode()) == msg.model_dump()
+    assert StandardMessage.decode(msg.encode()) == msg
+
+
+def test_encode_falls_back_to_pydantic_for_payloads_orjson_rejects():
+    msg = _message({"tags": {"a"}})
+    assert orjson.loads(msg.encode())["payload"] == {"tags": ["a"]}
+
+
+def test_parse_message_from_stream_accepts_bytes_keyed_entries():
+    msg = _message()
+    assert parse_message_from_stream({b"body": msg.encode()}) == msg
+    assert parse_message_from_stream({"body": msg.encode().decode()}) == msg
+    assert parse_message_from_stream({b"other": b"x"}) is None
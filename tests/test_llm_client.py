@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+import shared.llm_client as llm_client
+from shared.llm_client import LLMCallBatcher
+
+
+def _ok_response(name="f"):
+    return {"choices": [{"message": {"tool_calls": [{"function": {"name": name, "arguments": "{}"}}]}}]}
+
+
+@pytest.fixture
+def mock_openai(monkeypatch):
+    """Routes the shared client through a MockTransport; the handler is swappable per test."""
+    state = {"handler": lambda request: httpx.Response(200, json=_ok_response())}
+
+    async def dispatch(request):
+        result = state["handler"](request)
+        return await result if asyncio.iscoroutine(result) else result
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client, "_client", None)
+    monkeypatch.setattr(llm_client, "_make_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(dispatch)))
+    return state
+
+
+def test_close_fails_requests_not_yet_dispatched(mock_openai):
+    async def scenario():
+        batcher = LLMCallBatcher(batch_window_ms=10_000)
+        first = asyncio.ensure_future(batcher.submit({"messages": []}))
+        await asyncio.sleep(0.01)  # picked up by the collect loop, window still open
+        second = asyncio.ensure_future(batcher.submit({"messages": []}))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(batcher.close(), timeout=2)
+
+        for task in (first, second):
+            with pytest.raises(RuntimeError, match="batcher closed"):
+                await asyncio.wait_for(task, timeout=2)
+        with pytest.raises(RuntimeError, match="batcher closed"):
+            await batcher.submit({"messages": []})
+
+    asyncio.run(scenario())
+
+
+def test_close_waits_for_in_flight_requests(mock_openai):
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=_ok_response("slow"))
+
+    mock_openai["handler"] = slow
+
+    async def scenario():
+        batcher = LLMCallBatcher(batch_window_ms=1)
+        task = asyncio.ensure_future(batcher.submit({"messages": []}))
+        await asyncio.sleep(0.02)  # batch dispatched, response still pending
+        await batcher.close()
+        assert task.done()
+        assert task.result() == _ok_response("slow")
+
+    asyncio.run(scenario())
+
+
+def test_provider_errors_propagate_to_the_submitter(mock_openai):
+    def handler(request):
+        if b"boom" in request.content:
+            return httpx.Response(500)
+        return httpx.Response(200, json=_ok_response())
+
+    mock_openai["handler"] = handler
+
+    async def scenario():
+        batcher = LLMCallBatcher(qpm=60_000)
+        bodies = [{"messages": [{"role": "user", "content": "boom" if i == 1 else "hi"}]} for i in range(3)]
+        results = await asyncio.gather(*(batcher.submit(b) for b in bodies), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results[0] == _ok_response()
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[2] == _ok_response()
+
+
+def test_batcher_can_be_shared_across_event_loops(mock_openai):
+    batcher = LLMCallBatcher(batch_window_ms=1)
+
+    async def one_call():
+        return await asyncio.wait_for(batcher.submit({"messages": []}), timeout=2)
+
+    assert asyncio.run(one_call()) == _ok_response()
+    assert asyncio.run(one_call()) == _ok_response()
+
+
+def test_crashed_collector_fails_waiting_callers(mock_openai, monkeypatch):
+    def crash(*args, **kwargs):
+        raise ValueError("boom")
+
+    async def scenario():
+        batcher = LLMCallBatcher(batch_window_ms=1, max_batch=1)
+        with monkeypatch.context() as m:
+            m.setattr(llm_client.logger, "debug", crash)
+            tasks = [asyncio.ensure_future(batcher.submit({"messages": []})) for _ in range(3)]
+            results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=2)
+        # The next submit starts a fresh collector.
+        after = await asyncio.wait_for(batcher.submit({"messages": []}), timeout=2)
+        return results, after
+
+    results, after = asyncio.run(scenario())
+    for result in results:
+        assert isinstance(result, RuntimeError) and "collector failed" in str(result)
+        assert isinstance(result.__cause__, ValueError)
+    assert after == _ok_response()
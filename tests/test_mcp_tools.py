@@ -0,0 +1,49 @@
+import pytest
+
+import shared.mcp_tools as mcp_tools
+from shared.mcp_tools import create_tool_use_request, register_gemini_cached_content, _static_prefix_key
+
+_TOOL_A = {"type": "function", "function": {"name": "a", "parameters": {"type": "object", "properties": {}}}}
+_TOOL_B = {"type": "function", "function": {"name": "b", "parameters": {"type": "object", "properties": {}}}}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_gemini_cache(monkeypatch):
+    monkeypatch.setattr(mcp_tools, "_GEMINI_CACHED_CONTENT", {})
+
+
+def _gemini_request(tools):
+    return create_tool_use_request(
+        conversation=[{"role": "user", "content": "hi"}],
+        tools=tools,
+        system_instruction="sys",
+        provider="gemini",
+        model="gemini-x",
+        cache_static=True,
+    )
+
+
+def test_static_prefix_key_depends_on_content_only():
+    key = _static_prefix_key("m", "sys", [_TOOL_A])
+    assert _static_prefix_key("m", "sys", [dict(_TOOL_A)]) == key
+    assert _static_prefix_key("m", "other", [_TOOL_A]) != key
+    assert _static_prefix_key("other", "sys", [_TOOL_A]) != key
+
+
+def test_gemini_request_references_registered_cached_content():
+    tools = [_TOOL_A]
+    register_gemini_cached_content("cachedContents/abc", model="gemini-x", system_instruction="sys", tools=tools)
+    body = _gemini_request(tools)
+    assert body["cachedContent"] == "cachedContents/abc"
+    assert "tools" not in body
+
+
+def test_editing_tools_in_place_stops_matching_the_cached_content():
+    tools = [_TOOL_A]
+    register_gemini_cached_content("cachedContents/old", model="gemini-x", system_instruction="sys", tools=tools)
+    assert _gemini_request(tools)["cachedContent"] == "cachedContents/old"
+
+    tools.append(_TOOL_B)
+    body = _gemini_request(tools)
+    assert "cachedContent" not in body
+    assert [d["name"] for d in body["tools"][0]["function_declarations"]] == ["a", "b"]
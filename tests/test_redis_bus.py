@@ -0,0 +1,79 @@
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+import redis
+
+from shared.a2a_envelope import StandardMessage, wrap_envelope
+from shared.async_redis_bus import AsyncRedisBus
+from shared.redis_bus import _BODY_FIELD, RedisBus, _parse_batch
+
+
+def _message(i, stream="s1"):
+    return wrap_envelope(payload={"i": i}, source_name="a", source_version="1", target_stream=stream)
+
+
+@pytest.fixture
+def sync_bus(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *a, **kw: fakeredis.FakeRedis(server=server))
+    return RedisBus()
+
+
+def test_parse_batch_splits_parsed_entries_from_unparseable_ones():
+    msg = _message(1)
+    response = [
+        [b"s1", [(b"1-0", {_BODY_FIELD: msg.encode()}), (b"1-1", {_BODY_FIELD: b"not json"})]],
+        [b"s2", [(b"2-0", {b"other": b"x"})]],
+        [b"s3", []],
+    ]
+    parsed, skipped = _parse_batch(response)
+    assert [(s, i, m.envelope.message_id) for s, i, m in parsed] == [(b"s1", b"1-0", msg.envelope.message_id)]
+    assert skipped == [(b"s1", [b"1-1"]), (b"s2", [b"2-0"])]
+
+
+def test_subscribe_leaves_undelivered_batch_entries_pending(sync_bus):
+    for i in range(3):
+        sync_bus.publish(_message(i))
+
+    gen = sync_bus.subscribe("g", "c1", ["s1"], count=3)
+    assert next(gen).payload == {"i": 0}
+    gen.close()
+
+    pending = sync_bus.client.xpending_range("s1", "g", min="-", max="+", count=10)
+    assert len(pending) == 2
+    # Reading the pending list again returns exactly the undelivered entries.
+    redelivered = sync_bus.client.xreadgroup("g", "c1", {"s1": "0"}, count=10)
+    assert [StandardMessage.decode(data[_BODY_FIELD]).payload for _, data in redelivered[0][1]] == [{"i": 1}, {"i": 2}]
+
+
+def test_subscribe_acks_the_whole_batch_once_consumed(sync_bus):
+    for i in range(3):
+        sync_bus.publish(_message(i))
+    sync_bus.publish(_message(99, stream="other"))
+
+    gen = sync_bus.subscribe("g", "c1", ["s1"], count=3)
+    assert [next(gen).payload["i"] for _ in range(3)] == [0, 1, 2]
+    sync_bus.publish(_message(3))
+    assert next(gen).payload == {"i": 3}  # pulling the next batch acks the previous one
+
+    assert sync_bus.client.xpending("s1", "g")["pending"] == 1
+
+
+def test_async_subscribe_leaves_undelivered_batch_entries_pending():
+    async def scenario():
+        bus = AsyncRedisBus()
+        bus.client = fakeredis.aioredis.FakeRedis()
+        for i in range(3):
+            await bus.publish(_message(i))
+
+        gen = bus.subscribe("g", "c1", ["s1"], count=3)
+        first = await gen.__anext__()
+        await gen.aclose()
+        return first, await bus.client.xpending("s1", "g")
+
+    first, pending = asyncio.run(scenario())
+    assert first.payload == {"i": 0}
+    assert pending["pending"] == 2
+
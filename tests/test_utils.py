@@ -0,0 +1,65 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import shared._utils as utils
+from shared._utils import _fast_id, _fast_iso_utc
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Pins time.time_ns to a settable value and starts with an empty prefix cache."""
+    clock = {"ns": 0}
+    monkeypatch.setattr(time, "time_ns", lambda: clock["ns"])
+    monkeypatch.setattr(utils, "_iso_cache", threading.local())
+    return clock
+
+
+def test_fast_iso_utc_is_tz_aware_utc_with_millisecond_precision():
+    before = datetime.now(timezone.utc)
+    stamp = _fast_iso_utc()
+    parsed = datetime.fromisoformat(stamp)
+
+    assert stamp.endswith("+00:00")
+    assert parsed.utcoffset() == timedelta(0)
+    assert len(stamp.split(".")[1]) == len("123+00:00")
+    assert parsed.microsecond % 1000 == 0
+    assert before - timedelta(milliseconds=1) <= parsed <= datetime.now(timezone.utc)
+
+
+def test_fast_iso_utc_prefix_rolls_over_at_second_boundary(fake_clock):
+    base = 1_700_000_000 * 1_000_000_000  # 2023-11-14T22:13:20Z
+    expected = datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+    fake_clock["ns"] = base + 998_700_000
+    assert _fast_iso_utc() == "2023-11-14T22:13:20.998+00:00"
+    fake_clock["ns"] = base + 999_999_999
+    assert _fast_iso_utc() == "2023-11-14T22:13:20.999+00:00"
+    fake_clock["ns"] = base + 1_000_000_000
+    assert _fast_iso_utc() == "2023-11-14T22:13:21.000+00:00"
+    fake_clock["ns"] = base + 61_000_000_007
+    assert datetime.fromisoformat(_fast_iso_utc()) == expected + timedelta(seconds=61)
+
+
+def test_fast_id_is_rfc_uuid7():
+    for _ in range(100):
+        u = uuid.UUID(_fast_id())
+        assert u.version == 7 and u.variant == uuid.RFC_4122
+
+
+def test_fast_id_embeds_the_unix_millisecond_timestamp(fake_clock):
+    fake_clock["ns"] = 1_700_000_000_123_456_789
+    value = _fast_id()
+    assert uuid.UUID(value).int >> 80 == 1_700_000_000_123
+
+
+def test_fast_ids_from_consecutive_milliseconds_sort_in_order(fake_clock):
+    ids = []
+    for ms in range(1_700_000_000_000, 1_700_000_000_050):
+        fake_clock["ns"] = ms * 1_000_000 + 999_999
+        ids.append(_fast_id())
+    assert sorted(ids) == ids
+    assert len(set(ids)) == len(ids)